@@ -8,8 +8,8 @@ from backend.config import Config
 # Import for scheduler (add this if you want the scheduler, otherwise remove the scheduler code block)
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit # For scheduler shutdown
-from backend.scrapers.scraper_manager import ScraperManager # Import for scheduler
-from backend.models.trend_model import Trend # Import for scheduler
+from backend.scrapers.scraper_manager import ScraperManager, SCRAPER_CLASSES # Import for scheduler
+from backend.scrapers import scrape_schedule # Import for scheduler
 
 def create_app():
     app = Flask(__name__)
@@ -35,49 +35,50 @@ def create_app():
     # --- Scheduler Setup (Optional) ---
     # Only include this block if you want automatic scraping
     # Remove this block if you only want manual scraping via the button
-    if not app.config.get('TESTING'): # Don't run scheduler if in testing mode
+    # Don't run scheduler if in testing mode or in a script / scrape_worker.py process
+    if app.config.get('SCHEDULER_ENABLED') and not app.config.get('TESTING'):
         scheduler = BackgroundScheduler()
 
         def scheduled_scrape():
-            """Function to run the scraping job."""
-            print("Scheduler: Starting scheduled scrape...")
-            scraper_manager = ScraperManager() # Create manager inside the function
-            all_trends = []
-            enabled_platforms = scraper_manager.get_enabled_platforms()
-            for platform in enabled_platforms:
-                try:
-                    trends = scraper_manager.get_trends(platform, limit=10) # Adjust limit as needed
-                    all_trends.extend(trends)
-                    print(f"Scheduler: Scraped {len(trends)} trends from {platform}")
-                except Exception as e:
-                    print(f"Scheduler: Error scraping {platform}: {e}")
+            """Scrape every platform whose adaptive interval has elapsed."""
+            with app.app_context(): # The scheduler thread has no app context of its own
+                scraper_manager = None
+                for platform in SCRAPER_CLASSES:
+                    # Claimed just before running, so no other worker scrapes it meanwhile
+                    run = scrape_schedule.claim_run(platform)
+                    if run is None:
+                        continue
+                    print(f"Scheduler: Starting scheduled scrape for {platform}...")
+                    if scraper_manager is None:
+                        scraper_manager = ScraperManager() # Create manager inside the function
+                    enabled_platforms = scraper_manager.get_enabled_platforms()
+                    if platform not in enabled_platforms:
+                        # Record an empty run so an unconfigured platform is checked less often
+                        scrape_schedule.finish_run(run, 0, 0, 0)
+                        continue
+                    try:
+                        trends = scraper_manager.get_trends(platform, limit=run.scrape_limit)
+                        print(f"Scheduler: Scraped {len(trends)} trends from {platform}")
+                        scrape = scraper_manager.last_scrape(platform)
+                        saved_count, updated_count = scraper_manager.save_trends(trends, scrape['stat_updates'])
+                        scrape_schedule.finish_run(run, len(trends), saved_count, updated_count,
+                                                   scrape['seen'], scrape['known'])
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Scheduler: Error scraping {platform}: {e}")
+                        # Count it as an empty run so a failing platform backs off
+                        scrape_schedule.finish_run(run, 0, 0, 0)
 
-            # Save trends to database (similar logic to /scrape route)
-            saved_count = 0
-            for trend_data in all_trends:
-                # Check if trend already exists (by platform_id and platform)
-                existing_trend = Trend.query.filter_by(platform_id=trend_data.platform_id, platform=trend_data.platform).first()
-                if not existing_trend:
-                    db.session.add(trend_data)
-                    saved_count += 1
-                else:
-                    print(f"Scheduler: Skipping duplicate trend: {trend_data.title[:50]}... (ID: {trend_data.platform_id})")
-
-            try:
-                db.session.commit()
-                print(f"Scheduler: Committed {saved_count} new trends to database.")
-            except Exception as e:
-                db.session.rollback()
-                print(f"Scheduler: Error committing trends to database: {e}")
-
-        # Schedule the job to run every 6 hours
+        # Check every minute which platforms are due; each platform's interval
+        # and limit adapt to its yield (see backend/scrapers/scrape_schedule.py)
         scheduler.add_job(
             func=scheduled_scrape,
             trigger="interval",
-            hours=6, # Run every 6 hours (adjust as needed)
+            seconds=60,
             id='scrape_trends_job',
-            name='Scrape trends from all enabled platforms',
-            replace_existing=True
+            name='Scrape trends from platforms that are due',
+            replace_existing=True,
+            max_instances=1
         )
 
         scheduler.start()
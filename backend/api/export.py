@@ -0,0 +1,140 @@
+# backend/api/export.py
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from backend.models.trend_model import Trend
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # Parquet export is optional
+    pa = None
+    pq = None
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Columns written to every export, in output order
+EXPORT_COLUMNS = [
+    Trend.id, Trend.title, Trend.description, Trend.url, Trend.platform,
+    Trend.platform_id, Trend.author, Trend.thumbnail_url, Trend.view_count,
+    Trend.like_count, Trend.comment_count, Trend.engagement_score,
+    Trend.published_at, Trend.duration, Trend.category, Trend.created_at
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_FORMATS = {
+    'csv': {'mimetype': 'text/csv', 'extension': 'csv'},
+    'ndjson': {'mimetype': 'application/x-ndjson', 'extension': 'ndjson'},
+    'parquet': {'mimetype': 'application/vnd.apache.parquet', 'extension': 'parquet'},
+}
+
+def parquet_available():
+    """Check if pyarrow is installed so Parquet exports can be served."""
+    return pa is not None
+
+def iter_rows(query):
+    """Stream plain row tuples from the query through a server-side cursor."""
+    # Selecting columns (not Trend objects) keeps the session identity map empty,
+    # so memory stays flat no matter how many rows are exported.
+    rows = query.with_entities(*EXPORT_COLUMNS).order_by(Trend.id).yield_per(EXPORT_BATCH_SIZE)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def generate_csv(batches):
+    """Yield CSV text chunks, one per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_format_value(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def generate_ndjson(batches):
+    """Yield newline-delimited JSON chunks, one per batch of rows."""
+    for batch in batches:
+        lines = [
+            json.dumps({field: _format_value(value) for field, value in zip(EXPORT_FIELDS, row)})
+            for row in batch
+        ]
+        yield '\n'.join(lines) + '\n'
+
+class _ParquetSink:
+    """Write-only file object that hands written bytes back to the generator."""
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def generate_parquet(batches):
+    """Yield Parquet bytes, writing one row group per batch of rows."""
+    schema = pa.schema([
+        ('id', pa.int64()), ('title', pa.string()), ('description', pa.string()),
+        ('url', pa.string()), ('platform', pa.string()), ('platform_id', pa.string()),
+        ('author', pa.string()), ('thumbnail_url', pa.string()), ('view_count', pa.int64()),
+        ('like_count', pa.int64()), ('comment_count', pa.int64()),
+        ('engagement_score', pa.int64()), ('published_at', pa.timestamp('us')),
+        ('duration', pa.int64()), ('category', pa.string()), ('created_at', pa.timestamp('us')),
+    ])
+    sink = _ParquetSink()
+    # Parquet compresses per column chunk, so the response itself is not gzipped
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='snappy')
+    for batch in batches:
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        ))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+def gzip_stream(chunks):
+    """Gzip a stream of text or byte chunks on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31 writes a gzip header
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
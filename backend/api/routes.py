@@ -1,27 +1,57 @@
 # backend/api/routes.py
-from flask import Blueprint, jsonify, request
+import requests
+import praw
+from datetime import datetime
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from backend.scrapers.scraper_manager import ScraperManager
+from backend.scrapers import scrape_schedule
 from backend.models.trend_model import Trend
+from backend.models import ranking_snapshot
+from backend.api import export
+from backend.config import Config
 from backend import db
 
 api_bp = Blueprint('api', __name__)
 
+def _filtered_trends_query(args):
+    """Build a Trend query from the platform, category and time-range filters."""
+    platform = args.get('platform')
+    category = args.get('category')
+    since = args.get('since') # ISO 8601, matched against published_at
+    until = args.get('until')
+
+    query = Trend.query
+
+    if platform:
+        query = query.filter(Trend.platform == platform)
+    if category:
+        query = query.filter(Trend.category.ilike(f'%{category}%')) # Case-insensitive partial match
+    if since:
+        query = query.filter(Trend.published_at >= datetime.fromisoformat(since))
+    if until:
+        query = query.filter(Trend.published_at < datetime.fromisoformat(until))
+    return query
+
 @api_bp.route('/trends', methods=['GET'])
 def get_trends():
     try:
         # Get query parameters
-        platform = request.args.get('platform')
-        category = request.args.get('category')
         limit = request.args.get('limit', default=20, type=int)
         offset = request.args.get('offset', default=0, type=int)
 
-        # Build query
-        query = Trend.query
+        # Serve the default ranked listings from the shared snapshot when possible
+        if not request.args.get('since') and not request.args.get('until'):
+            snapshot = ranking_snapshot.current_snapshot()
+            if snapshot:
+                page = snapshot.get_page(request.args.get('platform'), request.args.get('category'), offset, limit)
+                if page is not None:
+                    return jsonify(page)
 
-        if platform:
-            query = query.filter(Trend.platform == platform)
-        if category:
-            query = query.filter(Trend.category.ilike(f'%{category}%')) # Case-insensitive partial match
+        # Build query
+        try:
+            query = _filtered_trends_query(request.args)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid time range: {str(e)}'}), 400
 
         # Order by engagement score (descending) and published date (descending)
         query = query.order_by(Trend.engagement_score.desc(), Trend.published_at.desc())
@@ -36,6 +66,42 @@ def get_trends():
         traceback.print_exc()
         return jsonify({'error': 'Internal server error'}), 500
 
+@api_bp.route('/trends/export', methods=['GET'])
+def export_trends():
+    """Stream every matching trend as CSV, NDJSON or Parquet in a single response."""
+    export_format = request.args.get('format', default='csv').lower()
+    if export_format not in export.EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    if export_format == 'parquet' and not export.parquet_available():
+        return jsonify({'error': 'Parquet export requires pyarrow to be installed.'}), 400
+
+    try:
+        query = _filtered_trends_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid time range: {str(e)}'}), 400
+
+    generators = {
+        'csv': export.generate_csv,
+        'ndjson': export.generate_ndjson,
+        'parquet': export.generate_parquet,
+    }
+    chunks = generators[export_format](export.iter_rows(query))
+
+    headers = {
+        'Content-Disposition': f"attachment; filename=trends.{export.EXPORT_FORMATS[export_format]['extension']}"
+    }
+    # Text formats are gzipped on the fly when the client accepts it
+    if export_format != 'parquet' and request.accept_encodings['gzip'] > 0: # Honors gzip;q=0
+        chunks = export.gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=export.EXPORT_FORMATS[export_format]['mimetype'],
+        headers=headers
+    )
+
 @api_bp.route('/scrape', methods=['POST'])
 def scrape_trends():
     try:
@@ -45,6 +111,7 @@ def scrape_trends():
         limit_per_platform = data.get('limit_per_platform', 10)
 
         all_trends = []
+        stat_updates = {}
 
         if not platforms:
              platforms = scraper_manager.get_enabled_platforms()
@@ -57,27 +124,17 @@ def scrape_trends():
                 trends = scraper_manager.get_trends(platform, limit_per_platform)
                 print(f"Scraper returned {len(trends)} trends for {platform}.")
                 all_trends.extend(trends)
+                stat_updates.update(scraper_manager.last_scrape(platform)['stat_updates'])
             else:
                  print(f"Platform {platform} is not enabled.")
 
-        saved_count = 0
-        for trend_data in all_trends:
-            # Check if trend already exists (by platform_id and platform)
-            existing_trend = Trend.query.filter_by(platform_id=trend_data.platform_id, platform=trend_data.platform).first()
-            if not existing_trend:
-                print(f"Saving new trend: {trend_data.title[:50]}... (ID: {trend_data.platform_id})")
-                db.session.add(trend_data)
-                saved_count += 1
-            else:
-                 print(f"Skipping duplicate trend in DB: {trend_data.title[:50]}... (ID: {trend_data.platform_id})")
-
-        db.session.commit()
-        print(f"Committed {saved_count} new trends to database.")
+        saved_count, updated_count = scraper_manager.save_trends(all_trends, stat_updates)
 
         return jsonify({
             'message': f'Successfully scraped and saved {saved_count} new trends',
             'trends_scraped': len(all_trends),
             'trends_saved': saved_count,
+            'trends_updated': updated_count,
             'platforms_scraped': len([p for p in platforms if p in scraper_manager.get_enabled_platforms()])
         })
     except Exception as e:
@@ -103,6 +160,12 @@ def get_config():
         'scheduler_interval': 3600,
         'debug': True
     }
+    # Latest adaptive schedule state (yield, next interval and limit) per platform
+    try:
+        latest_runs = {platform: scrape_schedule.latest_run(platform) for platform in enabled_platforms}
+        config['scrape_runs'] = {platform: run.to_dict() for platform, run in latest_runs.items() if run}
+    except Exception as e:
+        print(f"Error loading scrape runs: {e}")
     return jsonify(config)
 
 # Endpoint to test a specific platform's API connection
@@ -115,7 +178,12 @@ def test_api():
         api_key = Config.PLATFORM_APIS['youtube'].get('api_key')
         if api_key:
             try:
-                response = requests.get(f"https://www.googleapis.com/youtube/v3/search?part=snippet&maxResults=1&q=test&key={api_key}")
+                base_url = Config.PLATFORM_APIS['youtube']['base_url']
+                response = requests.get(
+                    f"{base_url}/search",
+                    params={'part': 'snippet', 'maxResults': 1, 'q': 'test', 'key': api_key},
+                    timeout=15 # Never hold a worker thread indefinitely
+                )
                 response.raise_for_status()
                 if response.json().get('items'):
                     return jsonify({'message': 'YouTube API connection successful!'}), 200
@@ -1,5 +1,6 @@
 # backend/config.py
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv() # Load variables from .env file
@@ -9,9 +10,64 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///trendtracker.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Each gthread worker (see gunicorn.conf.py) runs GUNICORN_THREADS requests at once,
+    # plus the scheduler thread, so size the connection pool to match
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 8))
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': GUNICORN_THREADS + 1,
+            'max_overflow': 2,
+            'pool_pre_ping': True, # Drop connections the server closed while idle
+            'pool_recycle': 300
+        }
+
+    # Run the scrape scheduler in this process. Scripts and scrape_worker.py set it to false
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Precomputed top-N listings shared by all workers on a host (see ranking_snapshot.py).
+    # Set RANKING_SNAPSHOT_ENABLED=false to always query the database, e.g. when load-testing indexes
+    RANKING_SNAPSHOT_ENABLED = os.environ.get('RANKING_SNAPSHOT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RANKING_SNAPSHOT_PATH = os.environ.get('RANKING_SNAPSHOT_PATH') or os.path.join(tempfile.gettempdir(), 'trendtracker_rankings.bin')
+    RANKING_SNAPSHOT_DEPTH = int(os.environ.get('RANKING_SNAPSHOT_DEPTH', 100))
+    # How often each process checks that its snapshot still matches the database
+    RANKING_SNAPSHOT_CHECK_SECONDS = int(os.environ.get('RANKING_SNAPSHOT_CHECK_SECONDS', 10))
+
+    # Adaptive scheduled scraping: each platform's interval and limit follow its yield
+    SCRAPE_DEFAULT_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_DEFAULT_INTERVAL_SECONDS', 6 * 3600))
+    SCRAPE_MIN_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_MIN_INTERVAL_SECONDS', 1800))
+    SCRAPE_MAX_INTERVAL_SECONDS = int(os.environ.get('SCRAPE_MAX_INTERVAL_SECONDS', 24 * 3600))
+    SCRAPE_DEFAULT_LIMIT = int(os.environ.get('SCRAPE_DEFAULT_LIMIT', 10))
+    SCRAPE_MIN_LIMIT = int(os.environ.get('SCRAPE_MIN_LIMIT', 5))
+    SCRAPE_MAX_LIMIT = int(os.environ.get('SCRAPE_MAX_LIMIT', 60))
+    # Per-platform overrides of the bounds above (keys: min/max_interval_seconds, min/max_limit)
+    SCRAPE_PLATFORM_BOUNDS = {
+        # Each YouTube search costs 100 of the default 10,000 daily quota units. A run searches
+        # until it has 3x its limit in new candidates (20 -> 8+ searches, sharded or not; shards
+        # other workers already leased still finish). A run finding mostly stored videos searches
+        # every query, but its low yield stretches the interval
+        'youtube': {'min_interval_seconds': 3 * 3600, 'max_limit': 20},
+        # One post per search term (RedditScraper.search_terms has 9)
+        'reddit': {'min_limit': 9},
+    }
+
+    # Reload the per-process index of stored platform_ids (see known_ids.py) after this long,
+    # so web workers pick up trends committed by other processes
+    KNOWN_IDS_TTL_SECONDS = int(os.environ.get('KNOWN_IDS_TTL_SECONDS', 600))
+
+    # Split YouTube search queries into database-backed shards run by scrape_worker.py processes
+    SCRAPE_SHARDING = os.environ.get('SCRAPE_SHARDING', '').lower() in ('1', 'true', 'yes')
+    SCRAPE_SHARD_SIZE = int(os.environ.get('SCRAPE_SHARD_SIZE', 5)) # Queries per shard
+    SCRAPE_SHARD_LEASE_SECONDS = int(os.environ.get('SCRAPE_SHARD_LEASE_SECONDS', 300))
+    SCRAPE_SHARD_MAX_ATTEMPTS = int(os.environ.get('SCRAPE_SHARD_MAX_ATTEMPTS', 3))
+    SCRAPE_RUN_TIMEOUT_SECONDS = int(os.environ.get('SCRAPE_RUN_TIMEOUT_SECONDS', 1800))
+
     PLATFORM_APIS = {
         'youtube': {
-            'api_key': os.environ.get('YOUTUBE_API_KEY')
+            'api_key': os.environ.get('YOUTUBE_API_KEY'),
+            # Overridable so benchmarks can point at a local stand-in
+            'base_url': os.environ.get('YOUTUBE_API_BASE_URL') or 'https://www.googleapis.com/youtube/v3'
         },
         'reddit': {
             'client_id': os.environ.get('REDDIT_CLIENT_ID'),
@@ -0,0 +1,13 @@
+# backend/models/platform_schedule_model.py
+from backend import db
+from datetime import datetime
+
+class PlatformSchedule(db.Model):
+    # One row per platform; claiming a run is a compare-and-set on running_since
+    platform = db.Column(db.String(50), primary_key=True) # e.g., 'youtube', 'reddit'
+    next_run_at = db.Column(db.DateTime, nullable=False)
+    running_since = db.Column(db.DateTime) # Set while a process is scraping the platform
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PlatformSchedule {self.platform} next {self.next_run_at}>'
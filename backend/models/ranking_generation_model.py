@@ -0,0 +1,12 @@
+# backend/models/ranking_generation_model.py
+from backend import db
+from datetime import datetime
+
+class RankingGeneration(db.Model):
+    # Single row (id 1) whose token changes in every transaction that writes trends
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(32), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<RankingGeneration {self.token}>'
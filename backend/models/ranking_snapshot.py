@@ -0,0 +1,331 @@
+# backend/models/ranking_snapshot.py
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from backend import db
+from backend.models.trend_model import Trend
+from backend.models.ranking_generation_model import RankingGeneration
+from backend.config import Config
+
+# File layout: header | key table | records | index | string heap
+#   header  - magic, version, generated_at (us), depth, key/record/index counts,
+#             generation token of the database state it was built from
+#   key     - platform and category string refs, slice of the index array
+#   record  - one fixed-width row per trend, strings stored as heap refs
+#   index   - uint32 record numbers, each key's slice already in ranked order
+MAGIC = b'TTRS'
+VERSION = 2
+HEADER = struct.Struct('<4sHHqIIII32s')
+KEY = struct.Struct('<IIIIII')
+RECORD = struct.Struct('<I8q16I')
+INDEX = struct.Struct('<I')
+
+NULL_REF = 0xFFFFFFFF # String ref length for None (or "any" in the key table)
+EPOCH = datetime(1970, 1, 1)
+
+INT_FIELDS = ['id', 'view_count', 'like_count', 'comment_count', 'engagement_score',
+              'duration', 'published_at', 'created_at']
+STR_FIELDS = ['title', 'description', 'url', 'platform', 'platform_id', 'author',
+              'thumbnail_url', 'category']
+DATETIME_FIELDS = ('published_at', 'created_at')
+# Same key order as Trend.to_dict()
+DICT_FIELDS = ['id', 'title', 'description', 'url', 'platform', 'platform_id', 'author',
+               'thumbnail_url', 'view_count', 'like_count', 'comment_count', 'engagement_score',
+               'published_at', 'duration', 'category', 'created_at']
+
+def _to_micros(value):
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+class _Heap:
+    """Accumulates UTF-8 strings and hands out (offset, length) refs."""
+    def __init__(self):
+        self.data = bytearray()
+
+    def ref(self, value):
+        if value is None:
+            return 0, NULL_REF
+        encoded = value.encode('utf-8')
+        offset = len(self.data)
+        self.data += encoded
+        return offset, len(encoded)
+
+def _pack_record(trend, heap):
+    nulls = 0
+    ints = []
+    for bit, field in enumerate(INT_FIELDS):
+        value = getattr(trend, field)
+        if value is None:
+            nulls |= 1 << bit
+            value = 0
+        elif field in DATETIME_FIELDS:
+            value = _to_micros(value)
+        ints.append(value)
+    refs = []
+    for field in STR_FIELDS:
+        refs.extend(heap.ref(getattr(trend, field)))
+    return RECORD.pack(nulls, *ints, *refs)
+
+def bump_generation():
+    """Mark the trend table as changed. Call before committing trend writes.
+
+    Snapshots record the generation they were built from, so every process
+    (on any host) stops serving a snapshot once the database has moved on.
+    """
+    token = uuid.uuid4().hex
+    if RankingGeneration.query.filter_by(id=1).update({'token': token}, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested(): # Savepoint, so a lost insert race keeps the caller's writes
+            db.session.add(RankingGeneration(id=1, token=token))
+    except IntegrityError:
+        RankingGeneration.query.filter_by(id=1).update({'token': token}, synchronize_session=False)
+
+def current_generation():
+    return db.session.query(RankingGeneration.token).filter_by(id=1).scalar()
+
+def _ranked(partition_by, depth):
+    """Top `depth` trends per partition, in ranked order, from one windowed query."""
+    rank = db.func.row_number().over(
+        partition_by=partition_by,
+        order_by=[Trend.engagement_score.desc(), Trend.published_at.desc()]
+    ).label('rank')
+    ranked = db.session.query(Trend.id.label('id'), rank).subquery()
+    return db.session.query(Trend).join(ranked, Trend.id == ranked.c.id) \
+        .filter(ranked.c.rank <= depth).order_by(ranked.c.rank).all()
+
+def build_snapshot(path=None, depth=None):
+    """Write the top-N listing for every platform/category combination.
+
+    Keys cover all trends, each platform, each category and each
+    platform+category pair, matching the default GET /api/trends listings.
+    The file is written next to the target and swapped in with os.replace(),
+    so readers only ever see a complete snapshot.
+    """
+    global _checked_at
+    path = path or Config.RANKING_SNAPSHOT_PATH
+    depth = depth or Config.RANKING_SNAPSHOT_DEPTH
+
+    # Read first: writes committed while building make the snapshot stale, not wrong
+    generation = current_generation() or ''
+    # Four windowed scans instead of one ORDER BY ... LIMIT per listing
+    listings = {(None, None): []}
+    for by_platform, by_category in ((False, False), (True, False), (False, True), (True, True)):
+        partition_by = [column for column, used in ((Trend.platform, by_platform), (Trend.category, by_category)) if used]
+        for trend in _ranked(partition_by or None, depth):
+            if by_category and not trend.category:
+                continue # ilike never matches a missing category
+            key = (trend.platform if by_platform else None, trend.category if by_category else None)
+            listings.setdefault(key, []).append(trend)
+
+    heap = _Heap()
+    records = []
+    record_numbers = {} # trend id -> record number, a trend is stored once
+    key_entries = []
+    index = []
+    for (platform, category), ranked in sorted(listings.items(), key=lambda item: (item[0][0] or '', item[0][1] or '')):
+        start = len(index)
+        for trend in ranked:
+            if trend.id not in record_numbers:
+                record_numbers[trend.id] = len(records)
+                records.append(_pack_record(trend, heap))
+            index.append(record_numbers[trend.id])
+        platform_ref = heap.ref(platform)
+        category_ref = heap.ref(category)
+        key_entries.append(KEY.pack(*platform_ref, *category_ref, start, len(ranked)))
+
+    header = HEADER.pack(MAGIC, VERSION, 0, _to_micros(datetime.utcnow()), depth,
+                         len(key_entries), len(records), len(index), generation.encode('ascii'))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.rankings-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(b''.join(key_entries))
+            f.write(b''.join(records))
+            f.write(b''.join(INDEX.pack(n) for n in index))
+            f.write(heap.data)
+        os.replace(tmp_path, path) # Atomic swap, open mappings keep the old file
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    _checked_at = 0 # Compare against the database again on the next read
+    print(f"[RankingSnapshot] Wrote {len(records)} trends for {len(key_entries)} listings to {path}.")
+
+class RankingSnapshot:
+    """Read-only memory-mapped view of a snapshot file."""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, generated_at, depth, key_count, record_count, index_count, generation = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {VERSION} ranking snapshot: {path}")
+        self.generated_at = EPOCH + timedelta(microseconds=generated_at)
+        self.generation = generation.rstrip(b'\0').decode('ascii')
+        self.depth = depth
+        self._records_start = HEADER.size + key_count * KEY.size
+        self._index_start = self._records_start + record_count * RECORD.size
+        self._heap_start = self._index_start + index_count * INDEX.size
+
+        self.keys = {}
+        for i in range(key_count):
+            platform_off, platform_len, category_off, category_len, start, count = \
+                KEY.unpack_from(self._map, HEADER.size + i * KEY.size)
+            key = (self._string(platform_off, platform_len), self._string(category_off, category_len))
+            self.keys[key] = (start, count)
+
+    def close(self):
+        self._map.close()
+
+    def _string(self, offset, length):
+        if length == NULL_REF:
+            return None
+        start = self._heap_start + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _record_number(self, position):
+        return INDEX.unpack_from(self._map, self._index_start + position * INDEX.size)[0]
+
+    def _sort_key(self, record_number):
+        # Matches ORDER BY engagement_score DESC, published_at DESC
+        values = RECORD.unpack_from(self._map, self._records_start + record_number * RECORD.size)
+        return (-values[5], -values[7])
+
+    def _record(self, record_number):
+        values = RECORD.unpack_from(self._map, self._records_start + record_number * RECORD.size)
+        nulls, ints, refs = values[0], values[1:9], values[9:]
+        row = {}
+        for bit, (field, value) in enumerate(zip(INT_FIELDS, ints)):
+            if nulls & (1 << bit):
+                row[field] = None
+            elif field in DATETIME_FIELDS:
+                row[field] = (EPOCH + timedelta(microseconds=value)).isoformat()
+            else:
+                row[field] = value
+        for i, field in enumerate(STR_FIELDS):
+            row[field] = self._string(refs[2 * i], refs[2 * i + 1])
+        return {field: row[field] for field in DICT_FIELDS}
+
+    def _ranked(self, start, count):
+        return (self._record_number(start + i) for i in range(count))
+
+    def get_page(self, platform, category, offset, limit):
+        """Return a page of Trend dicts, or None if the snapshot can't answer it."""
+        if offset < 0 or limit < 0:
+            return None
+        platform = platform or None
+        if category:
+            # Mirror ilike '%category%' by merging every matching exact category
+            if any(c in category for c in '%_\\'):
+                return None
+            needle = category.lower()
+            slices = [self.keys[key] for key in self.keys
+                      if key[0] == platform and key[1] is not None and needle in key[1].lower()]
+        else:
+            if (platform, None) not in self.keys:
+                # Unknown platform: the full listing proves there are no matches
+                return [] if platform is not None else None
+            slices = [self.keys[(platform, None)]]
+
+        # A truncated listing can only serve pages within its depth
+        complete = all(count < self.depth for _, count in slices)
+        if not complete and offset + limit > self.depth:
+            return None
+
+        if len(slices) == 1:
+            ranked = self._ranked(*slices[0])
+        else:
+            ranked = heapq.merge(*(self._ranked(*s) for s in slices), key=self._sort_key)
+        page = []
+        for position, record_number in enumerate(ranked):
+            if position >= offset + limit:
+                break
+            if position >= offset:
+                page.append(self._record(record_number))
+        return page
+
+REBUILD_RETRY_SECONDS = 60 # Wait after a failed background rebuild before trying again
+
+_current = None
+_lock = threading.Lock()
+_checked_at = 0 # When this process last read the database generation
+_db_generation = None
+_rebuild_lock = threading.Lock()
+_rebuild_retry_at = 0 # After a failed rebuild, no new attempt before this time
+
+def _rebuild_in_background(app):
+    """Rebuild the snapshot from this process, unless a rebuild is already
+    running or the last one failed less than REBUILD_RETRY_SECONDS ago."""
+    if time.monotonic() < _rebuild_retry_at or not _rebuild_lock.acquire(blocking=False):
+        return
+
+    def rebuild():
+        global _rebuild_retry_at
+        try:
+            with app.app_context():
+                build_snapshot()
+            _rebuild_retry_at = 0
+        except Exception as e:
+            _rebuild_retry_at = time.monotonic() + REBUILD_RETRY_SECONDS
+            print(f"[RankingSnapshot] Background rebuild failed, retrying in {REBUILD_RETRY_SECONDS}s: {e}")
+        finally:
+            _rebuild_lock.release()
+
+    threading.Thread(target=rebuild, daemon=True).start()
+
+def current_snapshot(path=None):
+    """Return the newest snapshot for this process, or None if it is missing or stale.
+
+    The snapshot is served only while its generation matches the database's,
+    which is re-read at most every RANKING_SNAPSHOT_CHECK_SECONDS. A missing or
+    stale snapshot is rebuilt in the background while the caller falls back
+    to the database.
+    """
+    global _current, _checked_at, _db_generation
+    if not Config.RANKING_SNAPSHOT_ENABLED:
+        return None
+    path = path or Config.RANKING_SNAPSHOT_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _rebuild_in_background(current_app._get_current_object())
+        return None
+    with _lock:
+        if _current is None or (_current.stat.st_ino, _current.stat.st_mtime_ns) != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                snapshot = RankingSnapshot(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"[RankingSnapshot] Could not map {path}: {e}")
+                _rebuild_in_background(current_app._get_current_object())
+                return None
+            # Requests still holding the old snapshot keep a valid reference to
+            # it; its mapping is released when the object is garbage collected.
+            _current = snapshot
+
+        now = time.monotonic()
+        if now - _checked_at > Config.RANKING_SNAPSHOT_CHECK_SECONDS:
+            try:
+                _db_generation = current_generation() or ''
+            except Exception as e:
+                db.session.rollback()
+                print(f"[RankingSnapshot] Could not read the database generation: {e}")
+                _db_generation = None # Unknown: don't serve
+            _checked_at = now
+        if _current.generation != _db_generation:
+            if _db_generation is not None:
+                _rebuild_in_background(current_app._get_current_object())
+            return None
+        return _current
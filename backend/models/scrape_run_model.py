@@ -0,0 +1,37 @@
+# backend/models/scrape_run_model.py
+from backend import db
+from datetime import datetime
+
+class ScrapeRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.String(50), nullable=False, index=True) # e.g., 'youtube', 'reddit'
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime) # None while running
+    scrape_limit = db.Column(db.Integer, nullable=False) # Limit this run used
+    interval_seconds = db.Column(db.Integer, nullable=False) # Interval that led to this run
+    items_scraped = db.Column(db.Integer, default=0)
+    new_items = db.Column(db.Integer, default=0)
+    stat_changes = db.Column(db.Integer, default=0) # Stored trends whose engagement moved
+    candidates_seen = db.Column(db.Integer, default=0) # Unique videos/posts the searches found
+    candidates_known = db.Column(db.Integer, default=0) # ...of which were already stored
+    next_interval_seconds = db.Column(db.Integer) # Adjusted from this run's yield
+    next_limit = db.Column(db.Integer)
+
+    def to_dict(self):
+        return {
+            'platform': self.platform,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'scrape_limit': self.scrape_limit,
+            'interval_seconds': self.interval_seconds,
+            'items_scraped': self.items_scraped,
+            'new_items': self.new_items,
+            'stat_changes': self.stat_changes,
+            'candidates_seen': self.candidates_seen,
+            'candidates_known': self.candidates_known,
+            'next_interval_seconds': self.next_interval_seconds,
+            'next_limit': self.next_limit
+        }
+
+    def __repr__(self):
+        return f'<ScrapeRun {self.platform} {self.started_at}>'
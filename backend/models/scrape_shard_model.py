@@ -0,0 +1,20 @@
+# backend/models/scrape_shard_model.py
+from backend import db
+from datetime import datetime
+
+class ScrapeShard(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.String(64), nullable=False, index=True) # One scrape run = many shards
+    platform = db.Column(db.String(50), nullable=False) # e.g., 'youtube'
+    queries = db.Column(db.Text, nullable=False) # JSON list of search queries
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True) # pending, leased, done, failed, cancelled
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    lease_owner = db.Column(db.String(150)) # host:pid of the worker holding the lease
+    lease_expires_at = db.Column(db.DateTime)
+    results = db.Column(db.Text) # JSON list of candidates, set when done
+    error = db.Column(db.Text) # Last failure message
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ScrapeShard {self.run_id}#{self.id} {self.status}>'
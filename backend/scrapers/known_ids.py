@@ -0,0 +1,90 @@
+# backend/scrapers/known_ids.py
+import bisect
+import threading
+import time
+from backend import db
+from backend.models.trend_model import Trend
+from backend.config import Config
+
+LOAD_RETRY_SECONDS = 60 # Wait after a failed load before trying the database again
+
+class KnownIdIndex:
+    """Per-platform sorted array of platform_ids that are already stored.
+
+    Scrapers consult it before fetching details or parsing, so candidate slots
+    go to new items. Each process bulk-loads a platform's IDs on first use,
+    keeps the array current by calling add() after every successful commit,
+    and reloads it once it is older than KNOWN_IDS_TTL_SECONDS to pick up IDs
+    committed by other workers. Until then the database duplicate check at
+    ingestion still catches them.
+    """
+    def __init__(self):
+        self._ids = {}
+        self._loaded_at = {}
+        self._retry_at = {} # Platforms whose last load failed -> next attempt time
+        self._lock = threading.Lock()
+
+    def _load(self, platform):
+        """Bulk-load the sorted platform_ids for a platform."""
+        try:
+            rows = db.session.query(Trend.platform_id).filter(Trend.platform == platform).all()
+            ids = sorted(row[0] for row in rows)
+            print(f"[KnownIdIndex] Loaded {len(ids)} known IDs for {platform}.")
+        except Exception as e:
+            # Keep any older array; without one every candidate is treated as new
+            print(f"[KnownIdIndex] Could not load known IDs for {platform}, retrying in {LOAD_RETRY_SECONDS}s: {e}")
+            db.session.rollback()
+            self._retry_at[platform] = time.monotonic() + LOAD_RETRY_SECONDS
+            return self._ids.get(platform)
+        self._ids[platform] = ids
+        self._loaded_at[platform] = time.monotonic()
+        self._retry_at.pop(platform, None)
+        return ids
+
+    def _get(self, platform):
+        now = time.monotonic()
+        ids = self._ids.get(platform)
+        stale = ids is None or now - self._loaded_at[platform] > Config.KNOWN_IDS_TTL_SECONDS
+        if stale and now >= self._retry_at.get(platform, 0):
+            ids = self._load(platform)
+        return ids
+
+    def contains(self, platform, platform_id):
+        """Check if a platform_id is already stored for the platform."""
+        with self._lock:
+            ids = self._get(platform)
+            if not ids:
+                return False
+            i = bisect.bisect_left(ids, platform_id)
+            return i < len(ids) and ids[i] == platform_id
+
+    def add(self, platform, platform_ids):
+        """Record newly committed platform_ids for the platform."""
+        with self._lock:
+            ids = self._ids.get(platform)
+            if ids is None:
+                return # Not loaded yet, the next bulk load will include them
+            for platform_id in platform_ids:
+                i = bisect.bisect_left(ids, platform_id)
+                if i == len(ids) or ids[i] != platform_id:
+                    ids.insert(i, platform_id)
+
+    def add_keys(self, keys):
+        """Record newly committed (platform, platform_id) pairs."""
+        by_platform = {}
+        for platform, platform_id in keys:
+            by_platform.setdefault(platform, []).append(platform_id)
+        for platform, platform_ids in by_platform.items():
+            self.add(platform, platform_ids)
+
+    def reload(self, platform=None):
+        """Drop cached IDs so they are bulk-loaded again on next use."""
+        with self._lock:
+            platforms = [platform] if platform else list(self._ids) + list(self._retry_at)
+            for name in platforms:
+                self._ids.pop(name, None)
+                self._loaded_at.pop(name, None)
+                self._retry_at.pop(name, None)
+
+# Shared by all scrapers in this process
+known_ids = KnownIdIndex()
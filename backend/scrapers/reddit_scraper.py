@@ -3,8 +3,18 @@ import praw
 from datetime import datetime, timedelta
 from backend.models.trend_model import Trend
 from backend.config import Config
+from backend.scrapers.known_ids import known_ids
 
 class RedditScraper:
+    # Search for posts that might contain videos in popular subreddits
+    # This is a basic search; you might want to target specific subreddits
+    search_terms = [
+        "video", "funny video", "sad video", "emotional video", "anime video",
+        "movie clip", "music video", "dance video", "technology video"
+    ]
+    # Posts fetched per post wanted: many results are not videos or are already stored
+    OVERFETCH = 3
+
     def __init__(self):
         api_config = Config.PLATFORM_APIS.get('reddit', {})
         self.client_id = api_config.get('client_id')
@@ -27,6 +37,9 @@ class RedditScraper:
         else:
             print("[RedditScraper] Warning: Reddit API credentials not configured.")
             self.reddit = None
+        # Counts from the last get_trending_videos call, read by the scheduler:
+        # video posts seen, how many were already stored, and their fresh stats
+        self.last_scrape = {'seen': 0, 'known': 0, 'stat_updates': {}}
 
     def is_configured(self):
         """Check if the scraper has the necessary API keys."""
@@ -39,16 +52,13 @@ class RedditScraper:
             return []
 
         trends = []
+        stat_updates = {}
+        seen_count = 0
         try:
-            # Search for posts that might contain videos in popular subreddits
-            # This is a basic search; you might want to target specific subreddits
-            search_terms = [
-                "video", "funny video", "sad video", "emotional video", "anime video",
-                "movie clip", "music video", "dance video", "technology video"
-            ]
-
+            # At least one post per term, even when the limit is below the number of terms
+            per_term = max(1, -(-limit // len(self.search_terms))) * self.OVERFETCH
             seen_urls = set()
-            for term in search_terms:
+            for term in self.search_terms:
                 if len(trends) >= limit:
                     break
                 print(f"[RedditScraper] Searching Reddit for: {term}")
@@ -58,13 +68,23 @@ class RedditScraper:
                 # Note: PRAW doesn't directly support timestamp in search, this is a limitation
                 # A better approach might be to fetch hot/new posts from specific subreddits
                 # For now, we'll search globally for the term
-                posts = self.reddit.subreddit("all").search(term, limit=limit//len(search_terms))
+                posts = self.reddit.subreddit("all").search(term, limit=per_term)
                 for post in posts:
                     if len(trends) >= limit:
                         break
                     # Check if post is a video link or hosted video
                     if post.url and post.url not in seen_urls:
                         if post.url.endswith(('.mp4', '.mov', '.avi', '.webm', '.gif')) or 'v.redd.it' in post.url:
+                            seen_count += 1
+                            # Already stored: refresh its stats and let the slot go to a new post
+                            if known_ids.contains('reddit', post.id):
+                                stat_updates[('reddit', post.id)] = {
+                                    'like_count': post.score,
+                                    'comment_count': post.num_comments,
+                                    'engagement_score': post.score + post.num_comments
+                                }
+                                seen_urls.add(post.url)
+                                continue
                             trend = self._parse_post_data(post)
                             if trend:
                                 trends.append(trend)
@@ -75,6 +95,7 @@ class RedditScraper:
             import traceback
             traceback.print_exc()
 
+        self.last_scrape = {'seen': seen_count, 'known': len(stat_updates), 'stat_updates': stat_updates}
         print(f"[RedditScraper] === COMPLETED. Final trends list size: {len(trends)} ===")
         return trends
 
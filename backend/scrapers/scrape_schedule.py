@@ -0,0 +1,139 @@
+# backend/scrapers/scrape_schedule.py
+"""Adaptive per-platform scrape scheduling.
+
+Every scheduled scrape is recorded as a ScrapeRun with its yield: the share
+of videos/posts the scraper came across that were not stored yet, with
+stored ones whose engagement moved counting half. A platform that yields a
+lot is scraped sooner and deeper next time; a quiet one is scraped later and
+shallower, within the SCRAPE_MIN/MAX_INTERVAL_SECONDS and SCRAPE_MIN/MAX_LIMIT
+bounds or the platform's overrides in SCRAPE_PLATFORM_BOUNDS.
+
+State lives in the database, so it survives restarts and is shared by every
+process. Each platform's PlatformSchedule row holds its next due time; a
+process claims a due run with a compare-and-set on that row, so only one of
+the gunicorn workers running the scheduler scrapes it.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from backend import db
+from backend.models.scrape_run_model import ScrapeRun
+from backend.models.platform_schedule_model import PlatformSchedule
+from backend.config import Config
+
+HIGH_YIELD = 0.5 # At least half of what the scraper found was new: scrape sooner and deeper
+LOW_YIELD = 0.1 # Almost nothing new: back off
+# Multipliers applied to the interval and limit after a high- or low-yield run
+HIGH_YIELD_INTERVAL, HIGH_YIELD_LIMIT = 0.5, 1.5
+LOW_YIELD_INTERVAL, LOW_YIELD_LIMIT = 1.5, 0.75
+
+def bounds(platform):
+    """Return (min_interval, max_interval, min_limit, max_limit) for the platform."""
+    overrides = Config.SCRAPE_PLATFORM_BOUNDS.get(platform, {})
+    return (
+        overrides.get('min_interval_seconds', Config.SCRAPE_MIN_INTERVAL_SECONDS),
+        overrides.get('max_interval_seconds', Config.SCRAPE_MAX_INTERVAL_SECONDS),
+        overrides.get('min_limit', Config.SCRAPE_MIN_LIMIT),
+        overrides.get('max_limit', Config.SCRAPE_MAX_LIMIT)
+    )
+
+def clamp(platform, interval_seconds, limit):
+    """Keep an interval and limit within the platform's bounds."""
+    min_interval, max_interval, min_limit, max_limit = bounds(platform)
+    return (min(max(int(interval_seconds), min_interval), max_interval),
+            min(max(int(round(limit)), min_limit), max_limit))
+
+def latest_run(platform):
+    return ScrapeRun.query.filter_by(platform=platform).order_by(ScrapeRun.id.desc()).first()
+
+def next_settings(platform):
+    """Return (interval_seconds, limit) for the platform's next run."""
+    run = ScrapeRun.query.filter(ScrapeRun.platform == platform, ScrapeRun.finished_at.isnot(None)) \
+        .order_by(ScrapeRun.id.desc()).first()
+    if run:
+        # Re-clamped in case the bounds changed since the run was recorded
+        return clamp(platform, run.next_interval_seconds, run.next_limit)
+    return clamp(platform, Config.SCRAPE_DEFAULT_INTERVAL_SECONDS, Config.SCRAPE_DEFAULT_LIMIT)
+
+def _ensure_schedule(platform, now):
+    """Create the platform's schedule row if it is missing, due when its last run says."""
+    if db.session.get(PlatformSchedule, platform):
+        return
+    run = latest_run(platform)
+    if run and run.next_interval_seconds:
+        next_run_at = run.started_at + timedelta(seconds=run.next_interval_seconds)
+    else:
+        next_run_at = now
+    try:
+        with db.session.begin_nested(): # Savepoint: another process may insert it first
+            db.session.add(PlatformSchedule(platform=platform, next_run_at=next_run_at))
+    except IntegrityError:
+        pass
+    db.session.commit()
+
+def claim_run(platform):
+    """Start the platform's run if it is due and no other process has claimed it.
+
+    Returns the new ScrapeRun, or None.
+    """
+    now = datetime.utcnow()
+    _ensure_schedule(platform, now)
+    # A run that has not finished in twice the timeout died part-way through
+    stale_before = now - timedelta(seconds=Config.SCRAPE_RUN_TIMEOUT_SECONDS * 2)
+    # Compare-and-set: only one process's UPDATE can match a due, unclaimed row
+    claimed = PlatformSchedule.query.filter(
+        PlatformSchedule.platform == platform,
+        PlatformSchedule.next_run_at <= now,
+        or_(PlatformSchedule.running_since.is_(None), PlatformSchedule.running_since < stale_before)
+    ).update({'running_since': now}, synchronize_session=False)
+    db.session.commit()
+    if not claimed:
+        return None
+    return start_run(platform)
+
+def yield_rate(candidates_seen, candidates_known, stat_changes):
+    """Share of the items a run came across that were new, in [0, 1]."""
+    if not candidates_seen:
+        return 0.0
+    # A stat change is worth less than a new item, but still shows activity
+    return (candidates_seen - candidates_known + stat_changes / 2) / candidates_seen
+
+def adjust(platform, interval_seconds, limit, candidates_seen, candidates_known, stat_changes):
+    """Compute the platform's next (interval_seconds, limit) from one run's yield."""
+    rate = yield_rate(candidates_seen, candidates_known, stat_changes)
+    if rate >= HIGH_YIELD:
+        interval_seconds *= HIGH_YIELD_INTERVAL
+        limit *= HIGH_YIELD_LIMIT
+    elif rate < LOW_YIELD:
+        interval_seconds *= LOW_YIELD_INTERVAL
+        limit *= LOW_YIELD_LIMIT
+    return clamp(platform, interval_seconds, limit)
+
+def start_run(platform):
+    """Record the start of a run with the platform's current settings."""
+    interval_seconds, limit = next_settings(platform)
+    run = ScrapeRun(platform=platform, scrape_limit=limit, interval_seconds=interval_seconds)
+    db.session.add(run)
+    db.session.commit()
+    return run
+
+def finish_run(run, items_scraped, new_items, stat_changes, candidates_seen=0, candidates_known=0):
+    """Record a run's yield and the settings for the platform's next run."""
+    run.finished_at = datetime.utcnow()
+    run.items_scraped = items_scraped
+    run.new_items = new_items
+    run.stat_changes = stat_changes
+    run.candidates_seen = candidates_seen
+    run.candidates_known = candidates_known
+    run.next_interval_seconds, run.next_limit = adjust(
+        run.platform, run.interval_seconds, run.scrape_limit, candidates_seen, candidates_known, stat_changes
+    )
+    PlatformSchedule.query.filter_by(platform=run.platform).update({
+        'next_run_at': run.started_at + timedelta(seconds=run.next_interval_seconds),
+        'running_since': None
+    }, synchronize_session=False)
+    db.session.commit()
+    print(f"[ScrapeSchedule] {run.platform}: {candidates_seen - candidates_known} of {candidates_seen} found were new, "
+          f"{new_items} saved, {stat_changes} stored trends changed (limit {run.scrape_limit}). "
+          f"Next run in {run.next_interval_seconds // 60} min with limit {run.next_limit}.")
+    return run
@@ -1,19 +1,35 @@
 # backend/scrapers/scraper_manager.py
+from backend import db
+from backend.models.trend_model import Trend
+from backend.models import ranking_snapshot
+from backend.config import Config
 from backend.scrapers.youtube_scraper import YouTubeScraper
 from backend.scrapers.reddit_scraper import RedditScraper
+from backend.scrapers.known_ids import known_ids
 # Add other scrapers when implemented
 # from backend.scrapers.twitter_scraper import TwitterScraper
 # from backend.scrapers.tiktok_scraper import TikTokScraper
 
+SCRAPER_CLASSES = {
+    'youtube': YouTubeScraper,
+    'reddit': RedditScraper,
+    # 'twitter': TwitterScraper,
+    # 'tiktok': TikTokScraper,
+    # Add other scrapers here
+}
+
+STAT_FIELDS = ('view_count', 'like_count', 'comment_count', 'engagement_score')
+# Stored stats are only rewritten (and counted as a change) once engagement moved this much
+STAT_CHANGE_MIN = 0.1
+
+def _stats_changed(existing_trend, stats):
+    old_score = existing_trend.engagement_score or 0
+    new_score = stats.get('engagement_score', old_score)
+    return abs(new_score - old_score) >= max(old_score * STAT_CHANGE_MIN, 1)
+
 class ScraperManager:
     def __init__(self):
-        self.scrapers = {
-            'youtube': YouTubeScraper(),
-            'reddit': RedditScraper(),
-            # 'twitter': TwitterScraper(),
-            # 'tiktok': TikTokScraper(),
-            # Add other scrapers here
-        }
+        self.scrapers = {platform: scraper_class() for platform, scraper_class in SCRAPER_CLASSES.items()}
         # Determine enabled platforms based on config or environment variables
         self.enabled_platforms = self._get_enabled_platforms()
 
@@ -43,4 +59,67 @@ class ScraperManager:
                 return []
         else:
             print(f"Platform {platform} is not enabled or scraper not found.")
-            return []
\ No newline at end of file
+            return []
+
+    def last_scrape(self, platform):
+        """Counts from the platform's last get_trends call (see the scrapers' last_scrape)."""
+        scraper = self.scrapers.get(platform)
+        return getattr(scraper, 'last_scrape', None) or {'seen': 0, 'known': 0, 'stat_updates': {}}
+
+    def save_trends(self, trends, stat_updates=None):
+        """Save new trends and refresh the stats of stored ones.
+
+        stat_updates maps (platform, platform_id) of stored trends to fresh
+        stat fields, as collected in the scrapers' last_scrape. Returns
+        (new_count, updated_count), where updated_count counts stored trends
+        whose engagement moved by at least STAT_CHANGE_MIN. Commits, then
+        updates the known-ID index and rebuilds the ranking snapshot.
+        """
+        saved_trends = []
+        updated_count = 0
+        for trend_data in trends:
+            # Check if trend already exists (by platform_id and platform)
+            existing_trend = Trend.query.filter_by(platform_id=trend_data.platform_id, platform=trend_data.platform).first()
+            if not existing_trend:
+                print(f"Saving new trend: {trend_data.title[:50]}... (ID: {trend_data.platform_id})")
+                db.session.add(trend_data)
+                saved_trends.append(trend_data)
+            elif _stats_changed(existing_trend, {'engagement_score': trend_data.engagement_score}):
+                for field in STAT_FIELDS:
+                    setattr(existing_trend, field, getattr(trend_data, field))
+                updated_count += 1
+            else:
+                print(f"Skipping duplicate trend in DB: {trend_data.title[:50]}... (ID: {trend_data.platform_id})")
+
+        by_platform = {}
+        for (platform, platform_id), stats in (stat_updates or {}).items():
+            by_platform.setdefault(platform, {})[platform_id] = stats
+        for platform, platform_stats in by_platform.items():
+            platform_ids = list(platform_stats)
+            for i in range(0, len(platform_ids), 500):
+                for existing_trend in Trend.query.filter(Trend.platform == platform,
+                                                         Trend.platform_id.in_(platform_ids[i:i + 500])):
+                    stats = platform_stats[existing_trend.platform_id]
+                    if _stats_changed(existing_trend, stats):
+                        for field, value in stats.items():
+                            setattr(existing_trend, field, value)
+                        updated_count += 1
+
+        if not saved_trends and not updated_count:
+            return 0, 0
+
+        # Read keys before commit, which expires the saved objects
+        saved_keys = [(trend.platform, trend.platform_id) for trend in saved_trends]
+        ranking_snapshot.bump_generation() # Committed together with the trend writes
+        db.session.commit()
+        known_ids.add_keys(saved_keys)
+        print(f"Committed {len(saved_trends)} new trends and {updated_count} stat updates to database.")
+
+        if not Config.RANKING_SNAPSHOT_ENABLED:
+            return len(saved_trends), updated_count
+        try:
+            ranking_snapshot.build_snapshot()
+        except Exception as e:
+            # Listings fall back to the database until the next successful build
+            print(f"Error rebuilding ranking snapshot: {e}")
+        return len(saved_trends), updated_count
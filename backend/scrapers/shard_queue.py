@@ -0,0 +1,213 @@
+# backend/scrapers/shard_queue.py
+"""Database-backed work queue for sharded scraping.
+
+A scrape run splits its search queries into shards. Any process with access
+to the database (the coordinator itself, or scrape_worker.py on any node)
+claims a shard by taking a time-limited lease, runs its searches and detail
+fetches, and stores the candidates on the shard. Shards whose worker fails
+go back to pending; shards whose lease expires are reclaimed by the next
+claim. Both are retried up to SCRAPE_SHARD_MAX_ATTEMPTS times. Once the
+finished shards hold enough new candidates for the run's limit, its pending
+shards are cancelled so their searches don't spend API quota. Leases are
+set and compared using the database server's clock, so workers on nodes
+whose clocks disagree still see the same expiry.
+"""
+import json
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, and_, or_
+from backend import db
+from backend.models.scrape_shard_model import ScrapeShard
+from backend.config import Config
+from backend.scrapers.known_ids import known_ids
+
+def worker_id():
+    """Identify this process as a lease owner."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _db_now(offset_seconds=0):
+    """The database server's current UTC time, plus an optional offset."""
+    if db.engine.dialect.name == 'sqlite':
+        return db.func.datetime('now', f"{offset_seconds:+d} seconds", type_=DateTime)
+    now = db.func.timezone('UTC', db.func.now(), type_=DateTime) # PostgreSQL
+    return now + timedelta(seconds=offset_seconds) if offset_seconds else now
+
+def _claimable(now):
+    return or_(
+        ScrapeShard.status == 'pending',
+        and_(ScrapeShard.status == 'leased', ScrapeShard.lease_expires_at < now,
+             ScrapeShard.attempts < Config.SCRAPE_SHARD_MAX_ATTEMPTS)
+    )
+
+def create_run(platform, queries, shard_size=None):
+    """Enqueue the queries as shards of a new run and return its run_id."""
+    shard_size = shard_size or Config.SCRAPE_SHARD_SIZE
+    run_id = uuid.uuid4().hex
+    for i in range(0, len(queries), shard_size):
+        db.session.add(ScrapeShard(
+            run_id=run_id,
+            platform=platform,
+            queries=json.dumps(queries[i:i + shard_size])
+        ))
+    prune()
+    db.session.commit()
+    print(f"[ShardQueue] Created run {run_id} with {len(queries)} queries for {platform}.")
+    return run_id
+
+def prune(max_age=timedelta(days=1)):
+    """Delete shards of old runs."""
+    ScrapeShard.query.filter(ScrapeShard.created_at < datetime.utcnow() - max_age).delete(synchronize_session=False)
+
+def claim(platform, run_id=None, owner=None):
+    """Lease the next pending (or expired) shard, or return None if there is none."""
+    owner = owner or worker_id()
+    now = _db_now()
+
+    # Expired leases that used up their attempts are not retried again
+    ScrapeShard.query.filter(
+        ScrapeShard.status == 'leased',
+        ScrapeShard.lease_expires_at < now,
+        ScrapeShard.attempts >= Config.SCRAPE_SHARD_MAX_ATTEMPTS
+    ).update({'status': 'failed', 'error': 'Lease expired'}, synchronize_session=False)
+
+    query = ScrapeShard.query.filter(ScrapeShard.platform == platform, _claimable(now))
+    if run_id:
+        query = query.filter(ScrapeShard.run_id == run_id)
+    shard_ids = [row.id for row in query.order_by(ScrapeShard.id).with_entities(ScrapeShard.id).limit(10).all()]
+    db.session.commit()
+
+    for shard_id in shard_ids:
+        # Compare-and-set: only one worker's UPDATE can match a claimable shard
+        claimed = ScrapeShard.query.filter(ScrapeShard.id == shard_id, _claimable(now)).update({
+            'status': 'leased',
+            'lease_owner': owner,
+            'lease_expires_at': _db_now(Config.SCRAPE_SHARD_LEASE_SECONDS),
+            'attempts': ScrapeShard.attempts + 1
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return db.session.get(ScrapeShard, shard_id)
+    return None
+
+def _owned(shard, owner):
+    return ScrapeShard.query.filter(
+        ScrapeShard.id == shard.id,
+        ScrapeShard.status == 'leased',
+        ScrapeShard.lease_owner == owner
+    )
+
+def complete(shard, owner, results):
+    """Store a shard's candidates. Returns False if the lease was lost meanwhile."""
+    updated = _owned(shard, owner).update({
+        'status': 'done',
+        'results': json.dumps(results),
+        'lease_expires_at': None
+    }, synchronize_session=False)
+    db.session.commit()
+    return bool(updated)
+
+def fail(shard, owner, error):
+    """Release a shard for retry, or mark it failed once out of attempts."""
+    status = 'pending' if shard.attempts < Config.SCRAPE_SHARD_MAX_ATTEMPTS else 'failed'
+    _owned(shard, owner).update({
+        'status': status,
+        'error': str(error)[:1000],
+        'lease_expires_at': None
+    }, synchronize_session=False)
+    db.session.commit()
+
+def process_shard(scraper, shard, owner=None):
+    """Run one leased shard with the scraper and record the outcome."""
+    owner = owner or worker_id()
+    queries = json.loads(shard.queries)
+    print(f"[ShardQueue] {owner} running shard {shard.id} of run {shard.run_id} ({len(queries)} queries, attempt {shard.attempts}).")
+    try:
+        results = scraper.scrape_shard(queries)
+    except Exception as e:
+        print(f"[ShardQueue ERROR] Shard {shard.id} failed: {e}")
+        db.session.rollback()
+        fail(shard, owner, e)
+        return False
+    if not complete(shard, owner, results):
+        print(f"[ShardQueue] Lease on shard {shard.id} was lost, discarding its results.")
+        return False
+    return True
+
+def run_counts(run_id):
+    """Count a run's shards by status."""
+    rows = db.session.query(ScrapeShard.status, db.func.count(ScrapeShard.id)) \
+        .filter(ScrapeShard.run_id == run_id).group_by(ScrapeShard.status).all()
+    return dict(rows)
+
+def _candidate_count(run_id):
+    """Count the unique new candidates in a run's finished shards."""
+    video_ids = set()
+    for (results,) in db.session.query(ScrapeShard.results).filter_by(run_id=run_id, status='done'):
+        video_ids.update(result['item']['id']['videoId'] for result in json.loads(results or '{}').get('candidates', []))
+    return len(video_ids)
+
+def cancel_pending(run_id):
+    """Cancel a run's shards that no worker has started yet."""
+    cancelled = ScrapeShard.query.filter_by(run_id=run_id, status='pending') \
+        .update({'status': 'cancelled'}, synchronize_session=False)
+    db.session.commit()
+    return cancelled
+
+def run_sharded(scraper, platform, limit=None):
+    """Coordinate a sharded scrape and merge the deduplicated candidates.
+
+    The coordinator works through its own run's shards alongside any
+    scrape_worker.py processes, then waits for shards leased by others.
+    With a limit, the rest of the run is cancelled once the finished shards
+    hold limit * scraper.CANDIDATES_PER_TREND new candidates, like the
+    unsharded search loop; shards already leased still finish. Returns (candidates, video_details, known_stats) like the unsharded
+    search path, where known_stats maps already stored video IDs to fresh stats.
+    """
+    run_id = create_run(platform, scraper.search_queries)
+    owner = worker_id()
+    deadline = time.monotonic() + Config.SCRAPE_RUN_TIMEOUT_SECONDS
+
+    target = limit * scraper.CANDIDATES_PER_TREND if limit is not None else None
+    while True:
+        if target is not None and _candidate_count(run_id) >= target:
+            cancelled = cancel_pending(run_id)
+            if cancelled:
+                print(f"[ShardQueue] Run {run_id} has {target}+ candidates, cancelled {cancelled} pending shards.")
+        shard = claim(platform, run_id, owner)
+        if shard:
+            process_shard(scraper, shard, owner)
+            continue
+        counts = run_counts(run_id)
+        if not counts.get('pending') and not counts.get('leased'):
+            break
+        if time.monotonic() > deadline:
+            print(f"[ShardQueue] Run {run_id} timed out with {counts} shards, merging partial results.")
+            break
+        time.sleep(2) # Shards are leased by other workers, wait for them
+
+    candidates = []
+    video_details = {}
+    known_stats = {}
+    shards = ScrapeShard.query.filter_by(run_id=run_id, status='done').order_by(ScrapeShard.id).all()
+    for shard in shards:
+        results = json.loads(shard.results or '{}')
+        known_stats.update(results.get('known', {}))
+        for result in results.get('candidates', []):
+            video_id = result['item']['id']['videoId']
+            # Another shard may already have this video
+            if video_id in video_details:
+                continue
+            # A commit since the shard ran may have stored it: refresh its stats instead
+            if known_ids.contains(platform, video_id):
+                known_stats[video_id] = scraper._stats(result['detail'])
+                continue
+            candidates.append(result['item'])
+            video_details[video_id] = result['detail']
+    for video_id in video_details:
+        known_stats.pop(video_id, None) # New in this run after all
+    print(f"[ShardQueue] Run {run_id} merged {len(candidates)} unique candidates and {len(known_stats)} stored videos "
+          f"from {len(shards)} shards ({run_counts(run_id)}).")
+    return candidates, video_details, known_stats
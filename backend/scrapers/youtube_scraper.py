@@ -6,13 +6,21 @@ from datetime import datetime, timedelta
 from backend import db
 from backend.models.trend_model import Trend
 from backend.config import Config
+from backend.scrapers.known_ids import known_ids
+from backend.scrapers import shard_queue
 
 class YouTubeScraper:
+    # New candidates to collect per trend wanted; some fail the duration filter
+    CANDIDATES_PER_TREND = 3
+
     def __init__(self):
         self.api_key = Config.PLATFORM_APIS['youtube']['api_key']
         if not self.api_key:
             print("[YouTubeScraper] Warning: YouTube API key is not configured.")
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+        self.base_url = Config.PLATFORM_APIS['youtube']['base_url']
+        # Counts from the last get_trending_videos call, read by the scheduler:
+        # unique videos seen, how many were already stored, and their fresh stats
+        self.last_scrape = {'seen': 0, 'known': 0, 'stat_updates': {}}
 
         # --- Global, diverse search queries for short-form content ---
         # Focused on your specific requests, language-agnostic terms.
@@ -46,8 +54,12 @@ class YouTubeScraper:
         """Check if the scraper has the necessary API keys."""
         return bool(self.api_key)
 
-    def _search_videos(self, query, max_results=8, duration="short", order="relevance"):
-        """Search for videos globally on YouTube."""
+    def _search_videos(self, query, max_results=8, duration="short", order="relevance", raise_errors=False):
+        """Search for videos globally on YouTube.
+
+        Failures return [] unless raise_errors is set (used by scrape_shard, so a
+        failed shard is retried instead of stored as an empty result).
+        """
         if not self.api_key:
             print("[YouTubeScraper] API key missing, cannot search.")
             return []
@@ -81,10 +93,14 @@ class YouTubeScraper:
             # Retry with 'relevance' if 'viewCount' failed?
             if order != 'relevance':
                 print(f"[YouTubeScraper] Retrying '{query}' with 'relevance' order...")
-                return self._search_videos(query, max_results, duration, 'relevance')
+                return self._search_videos(query, max_results, duration, 'relevance', raise_errors)
+            if raise_errors:
+                raise
             return []
         except Exception as e:
             print(f"[YouTubeScraper ERROR] Unexpected error for '{query}': {e}")
+            if raise_errors:
+                raise
             return []
 
     def _get_video_ids(self, search_results):
@@ -93,8 +109,8 @@ class YouTubeScraper:
         print(f"[YouTubeScraper] Extracted {len(ids)} unique video IDs from search results.")
         return list(ids)
 
-    def _get_video_details_batch(self, video_ids):
-        """Get detailed stats for video IDs."""
+    def _get_video_details_batch(self, video_ids, raise_errors=False):
+        """Get detailed stats for video IDs. A failed batch is skipped unless raise_errors is set."""
         if not video_ids or not self.api_key:
             return {}
         url = f"{self.base_url}/videos"
@@ -114,6 +130,8 @@ class YouTubeScraper:
                 all_details.update(batch_details)
             except Exception as e:
                 print(f"[YouTubeScraper ERROR] Failed to get details for a batch: {e}")
+                if raise_errors:
+                    raise
         print(f"[YouTubeScraper] Retrieved details for {len(all_details)} videos.")
         return all_details
 
@@ -137,11 +155,61 @@ class YouTubeScraper:
             return []
         print(f"[YouTubeScraper] === STARTING GLOBAL scrape (Target: {limit} videos) ===")
 
-        # 1. Collect candidate videos from various searches
+        if Config.SCRAPE_SHARDING:
+            # Queries are split into shards run by every available worker
+            all_candidates, video_details, known_stats = shard_queue.run_sharded(self, 'youtube', limit)
+        else:
+            # 1. Collect candidate videos from various searches
+            all_candidates, known_video_ids = self._collect_candidates(self.search_queries, limit)
+
+            # 2. Get detailed information for candidates, and fresh stats for stored videos
+            candidate_ids = self._get_video_ids(all_candidates)
+            video_details = self._get_video_details_batch(candidate_ids + known_video_ids)
+            known_stats = {video_id: self._stats(video_details[video_id])
+                           for video_id in known_video_ids if video_id in video_details}
+
+        self.last_scrape = {
+            'seen': len(all_candidates) + len(known_stats),
+            'known': len(known_stats),
+            'stat_updates': {('youtube', video_id): stats for video_id, stats in known_stats.items()}
+        }
+
+        # 3. Process, filter by final duration, recalculate score, and create Trend objects
+        return self._build_trends(all_candidates, video_details, limit)
+
+    def scrape_shard(self, queries):
+        """Run the searches and detail fetches for one shard of queries.
+
+        Returns a JSON-serializable dict: 'candidates', a list of
+        {'item': search_item, 'detail': video_detail} for every new candidate
+        that has details, and 'known', the fresh stats of already stored
+        videos by ID. Raises if any search or detail batch failed, so the
+        shard goes back to the queue for another attempt.
+        """
+        candidates, known_video_ids = self._collect_candidates(queries, raise_errors=True)
+        video_details = self._get_video_details_batch(
+            self._get_video_ids(candidates) + known_video_ids, raise_errors=True
+        )
+        return {
+            'candidates': [
+                {'item': item, 'detail': video_details[item['id']['videoId']]}
+                for item in candidates if item['id']['videoId'] in video_details
+            ],
+            'known': {video_id: self._stats(video_details[video_id])
+                      for video_id in known_video_ids if video_id in video_details}
+        }
+
+    def _collect_candidates(self, queries, limit=None, raise_errors=False):
+        """Search each query and collect unique, not yet stored candidate videos.
+
+        Returns (candidates, known_video_ids); the stored videos the searches
+        found are kept so their stats can be refreshed.
+        """
         all_candidates = []
+        known_video_ids = []
         seen_ids = set()
 
-        for query in self.search_queries:
+        for query in queries:
             print(f"[YouTubeScraper] --- Searching for specific query: '{query}' ---")
 
             # Alternate strategies slightly to get variety
@@ -154,34 +222,40 @@ class YouTubeScraper:
                 query,
                 max_results=8, # Increased per query to get more candidates
                 duration=duration_strategy,
-                order=order_strategy
+                order=order_strategy,
+                raise_errors=raise_errors
             )
 
             added_this_query = 0
+            known_this_query = 0
             for item in items:
                 video_id = item.get('id', {}).get('videoId')
                 # Avoid Rickroll and duplicates
                 if video_id and video_id not in seen_ids and video_id != "dQw4w9WgXcQ":
                     seen_ids.add(video_id)
+                    # Already stored: skip before spending a detail fetch on it,
+                    # so the candidate slot goes to a new video instead
+                    if known_ids.contains('youtube', video_id):
+                        known_video_ids.append(video_id)
+                        known_this_query += 1
+                        continue
                     all_candidates.append(item)
                     added_this_query += 1
 
-            print(f"[YouTubeScraper] Added {added_this_query} candidates for '{query}'. Total candidates: {len(all_candidates)}")
+            print(f"[YouTubeScraper] Added {added_this_query} candidates for '{query}' (skipped {known_this_query} already stored). Total candidates: {len(all_candidates)}")
 
             time.sleep(0.05) # Be kind to the API
 
             # Stop early if we have plenty of candidates
-            if len(all_candidates) >= limit * 3: # Aim for 3x candidates
+            if limit is not None and len(all_candidates) >= limit * self.CANDIDATES_PER_TREND:
                 print(f"[YouTubeScraper] Found enough candidates ({len(all_candidates)}). Stopping search loop.")
                 break
 
         print(f"[YouTubeScraper] Finished search loop. Total unique candidates collected: {len(all_candidates)}")
+        return all_candidates, known_video_ids
 
-        # 2. Get detailed information for candidates
-        candidate_ids = self._get_video_ids(all_candidates)
-        video_details = self._get_video_details_batch(candidate_ids)
-
-        # 3. Process, filter by final duration, recalculate score, and create Trend objects
+    def _build_trends(self, all_candidates, video_details, limit):
+        """Filter candidates by duration, categorize them and create Trend objects."""
         trends = []
         processed_ids = set() # Double-check against duplicates in final list
 
@@ -238,6 +312,33 @@ class YouTubeScraper:
         print(f"[YouTubeScraper] === COMPLETED. Final unique trends list size: {len(trends)} ===")
         return trends
 
+    def _stats(self, video_detail):
+        """Extract view, like and comment counts and the engagement score from video details."""
+        stats = video_detail.get('statistics', {})
+        view_count = int(stats.get('viewCount', 0))
+        like_count = int(stats.get('likeCount', 0)) # Might be 0 if disabled
+        comment_count = int(stats.get('commentCount', 0))
+
+        duration_str = video_detail.get('contentDetails', {}).get('duration', 'PT0S')
+        duration_seconds = self._parse_duration(duration_str)
+
+        # Potentially better engagement score, considering view count magnitude
+        # and boosting shorter, highly engaged videos
+        base_score = view_count + (like_count * 2) + (comment_count * 3)
+        # Boost score for very short videos (< 90s) if they have decent engagement
+        if duration_seconds > 0 and duration_seconds < 90:
+             boost_factor = min(2.0, 90.0 / duration_seconds) # Up to 2x boost
+             engagement_score = int(base_score * boost_factor)
+        else:
+             engagement_score = base_score
+
+        return {
+            'view_count': view_count,
+            'like_count': like_count,
+            'comment_count': comment_count,
+            'engagement_score': engagement_score
+        }
+
     def _parse_video_data(self, search_item, video_detail):
         """Parse API data into a Trend object."""
         try:
@@ -270,24 +371,10 @@ class YouTubeScraper:
 
             url = f"https://www.youtube.com/watch?v={video_id}"
 
-            stats = video_detail.get('statistics', {})
-            view_count = int(stats.get('viewCount', 0))
-            like_count = int(stats.get('likeCount', 0)) # Might be 0 if disabled
-            comment_count = int(stats.get('commentCount', 0))
-
+            stats = self._stats(video_detail)
             duration_str = video_detail.get('contentDetails', {}).get('duration', 'PT0S')
             duration_seconds = self._parse_duration(duration_str)
 
-            # Potentially better engagement score, considering view count magnitude
-            # and boosting shorter, highly engaged videos
-            base_score = view_count + (like_count * 2) + (comment_count * 3)
-            # Boost score for very short videos (< 90s) if they have decent engagement
-            if duration_seconds > 0 and duration_seconds < 90:
-                 boost_factor = min(2.0, 90.0 / duration_seconds) # Up to 2x boost
-                 engagement_score = int(base_score * boost_factor)
-            else:
-                 engagement_score = base_score
-
             # --- Create Trend Object ---
             trend = Trend(
                 title=title[:255],
@@ -297,10 +384,10 @@ class YouTubeScraper:
                 platform_id=video_id,
                 author=channel_title[:150],
                 thumbnail_url=thumbnail_url,
-                view_count=view_count,
-                like_count=like_count,
-                comment_count=comment_count,
-                engagement_score=engagement_score,
+                view_count=stats['view_count'],
+                like_count=stats['like_count'],
+                comment_count=stats['comment_count'],
+                engagement_score=stats['engagement_score'],
                 published_at=published_date,
                 duration=duration_seconds,
                 category='' # Will be set by caller
@@ -0,0 +1,135 @@
+# bench_serving.py
+"""Compare sync and gthread gunicorn workers on an I/O-bound endpoint.
+
+Starts a local stand-in for the YouTube API that answers after --upstream-delay
+seconds, then for each worker class runs gunicorn with gunicorn.conf.py and
+drives POST /api/config/test with concurrent clients:
+    python bench_serving.py --clients 32 --duration 15
+
+Reports throughput and latency percentiles per worker class.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from load_test import percentile
+
+def start_upstream(delay):
+    """Serve a fake YouTube search response after a fixed delay."""
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps({'items': [{'id': {'videoId': 'bench'}}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return True
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    return False
+
+def drive(url, clients, duration):
+    """Send back-to-back requests from each client until the time is up."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = session.post(url, json={'platform': 'youtube'}, timeout=60).status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[0] += 1
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for _ in range(clients):
+            pool.submit(client)
+    return sorted(latencies), errors[0], time.monotonic() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gunicorn worker classes on /api/config/test.")
+    parser.add_argument('--clients', type=int, default=32, help="Concurrent clients (default: 32)")
+    parser.add_argument('--duration', type=float, default=15, help="Seconds per worker class (default: 15)")
+    parser.add_argument('--upstream-delay', type=float, default=0.25, help="Fake API latency in seconds (default: 0.25)")
+    parser.add_argument('--workers', type=int, default=2, help="Gunicorn workers, as on Render (default: 2)")
+    parser.add_argument('--threads', type=int, default=8, help="Threads per gthread worker (default: 8)")
+    parser.add_argument('--port', type=int, default=8765, help="Port for gunicorn (default: 8765)")
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.upstream_delay)
+    db_dir = tempfile.mkdtemp(prefix='trendtracker-bench-')
+    env = dict(
+        os.environ,
+        YOUTUBE_API_KEY='bench',
+        YOUTUBE_API_BASE_URL=f"http://127.0.0.1:{upstream.server_port}",
+        DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'bench.db')}",
+        REDDIT_CLIENT_ID='', REDDIT_CLIENT_SECRET='', # Keep Reddit auth out of the numbers
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        SCHEDULER_ENABLED='false', # No background scrapes during the measurement
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for worker_class in ('sync', 'gthread'):
+        print(f"Benchmarking {worker_class} workers ({args.clients} clients, {args.duration:.0f}s)...")
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-b', f"127.0.0.1:{args.port}", 'app:app'],
+            env=dict(env, GUNICORN_WORKER_CLASS=worker_class),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            if not wait_until_up(base_url + '/'):
+                print(f"gunicorn ({worker_class}) did not start.")
+                continue
+            results[worker_class] = drive(base_url + '/api/config/test', args.clients, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+    upstream.shutdown()
+
+    print(f"\n{'workers':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for worker_class, (latencies, errors, elapsed) in results.items():
+        print(f"{worker_class:<10}{len(latencies):>10}{errors:>8}{len(latencies) / elapsed:>10.1f}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}")
+    if len(results) == 2:
+        sync_rate = len(results['sync'][0]) / results['sync'][2]
+        gthread_rate = len(results['gthread'][0]) / results['gthread'][2]
+        if sync_rate:
+            print(f"\ngthread serves {gthread_rate / sync_rate:.1f}x the requests per second of sync.")
+    print(f"Theoretical upper bound with {args.upstream_delay * 1000:.0f} ms upstream latency: "
+          f"sync {args.workers / args.upstream_delay:.0f} req/s, "
+          f"gthread {args.workers * args.threads / args.upstream_delay:.0f} req/s.")
+
+if __name__ == '__main__':
+    main()
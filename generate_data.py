@@ -0,0 +1,124 @@
+# generate_data.py
+"""Bulk-load synthetic Trend rows for performance testing.
+
+Usage:
+    python generate_data.py --rows 1000000
+    python generate_data.py --rows 200000 --database-url postgresql://localhost/trendtracker_perf
+    python generate_data.py --rows 1000000 --no-snapshot  # measure the database read path
+"""
+import argparse
+import os
+import random
+import string
+import time
+from datetime import datetime, timedelta
+
+# Words the synthetic titles and categories are built from, based on the
+# scrapers' search queries so category filters hit realistic values
+CATEGORIES = [
+    "emotional scene", "sad scene", "heartbreaking moment", "touching story",
+    "anime scene", "anime clip", "iconic anime moment", "cartoon scene",
+    "movie clip", "best movie scene", "funny", "comedy skit", "funny moments",
+    "hilarious", "meme compilation", "music video", "new song", "viral music",
+    "dance", "viral dance", "technology", "tech review", "gadget unboxing", "ai",
+    "short film", "life hack", "motivational video", "reaction video", "misc"
+]
+TITLE_WORDS = [
+    "insane", "best", "epic", "sad", "funny", "moment", "scene", "reaction", "viral",
+    "new", "official", "clip", "compilation", "shorts", "challenge", "review", "top",
+    "ending", "anime", "movie", "dance", "song", "tech", "fail", "win", "crazy"
+]
+YOUTUBE_SHARE = 0.7 # The rest are Reddit posts
+
+def _random_id(rng, length):
+    return ''.join(rng.choice(string.ascii_letters + string.digits + '-_') for _ in range(length))
+
+def make_row(rng, now, run_tag, n):
+    """Build one Trend mapping with skewed, realistic-looking engagement."""
+    platform = 'youtube' if rng.random() < YOUTUBE_SHARE else 'reddit'
+    category = rng.choice(CATEGORIES)
+    published_at = now - timedelta(seconds=rng.randint(0, 30 * 86400))
+    # View counts are heavy-tailed: most items are small, a few go viral
+    view_count = int(rng.lognormvariate(9, 2.2)) if platform == 'youtube' else 0
+    like_count = int(max(view_count, 50) * rng.uniform(0.005, 0.08)) if platform == 'youtube' else int(rng.lognormvariate(5, 2))
+    comment_count = int(like_count * rng.uniform(0.01, 0.2))
+    duration = rng.randint(5, 720) if platform == 'youtube' else 0
+
+    if platform == 'youtube':
+        platform_id = f"{run_tag}{n:07d}" # 11 chars, like a YouTube video ID
+        url = f"https://www.youtube.com/watch?v={platform_id}"
+        engagement_score = view_count + like_count * 2 + comment_count * 3
+        if 0 < duration < 90:
+            engagement_score = int(engagement_score * min(2.0, 90.0 / duration))
+    else:
+        platform_id = f"{run_tag[:3]}{n:x}"
+        url = f"https://reddit.com/r/videos/comments/{platform_id}"
+        engagement_score = like_count + comment_count
+
+    title = ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(3, 10))).capitalize()
+    return {
+        'title': f"{title} #{category.replace(' ', '')}"[:255],
+        'description': ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(0, 40))),
+        'url': url,
+        'platform': platform,
+        'platform_id': platform_id,
+        'author': f"creator_{rng.randint(1, 50000)}",
+        'thumbnail_url': f"https://i.ytimg.com/vi/{platform_id}/hqdefault.jpg" if platform == 'youtube' else '',
+        'view_count': view_count,
+        'like_count': like_count,
+        'comment_count': comment_count,
+        'engagement_score': min(engagement_score, 2**31 - 1), # Integer column
+        'published_at': published_at,
+        'duration': duration,
+        'category': category,
+        'created_at': published_at + timedelta(minutes=rng.randint(1, 360)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic trends for performance testing.")
+    parser.add_argument('--rows', type=int, default=100000, help="Number of trends to insert (default: 100000)")
+    parser.add_argument('--batch-size', type=int, default=10000, help="Rows per INSERT batch (default: 10000)")
+    parser.add_argument('--database-url', help="Target database, e.g. sqlite:///perf.db (default: DATABASE_URL)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed, for repeatable datasets (default: 42)")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Don't rebuild the ranking snapshot, so listings are measured against the database")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url # Must be set before the app loads its Config
+    os.environ['SCHEDULER_ENABLED'] = 'false' # Don't scrape live data into the test database
+
+    from app import app
+    from backend import db
+    from backend.models.trend_model import Trend
+    from backend.models import ranking_snapshot
+
+    rng = random.Random(args.seed)
+    # Keeps platform_ids unique when the script is run more than once
+    run_tag = _random_id(random.Random(), 4)
+    now = datetime.utcnow()
+
+    with app.app_context():
+        db.create_all()
+        print(f"Loading {args.rows} synthetic trends into {app.config['SQLALCHEMY_DATABASE_URI']}...")
+        start = time.perf_counter()
+        inserted = 0
+        while inserted < args.rows:
+            size = min(args.batch_size, args.rows - inserted)
+            rows = [make_row(rng, now, run_tag, inserted + i) for i in range(size)]
+            db.session.bulk_insert_mappings(Trend, rows)
+            ranking_snapshot.bump_generation()
+            db.session.commit()
+            inserted += size
+            elapsed = time.perf_counter() - start
+            print(f"  {inserted}/{args.rows} rows ({inserted / elapsed:.0f} rows/s)")
+
+        print(f"Inserted {inserted} trends in {time.perf_counter() - start:.1f}s.")
+        # Listings are served from the snapshot, so rebuild it to include the new rows
+        if args.no_snapshot or not app.config['RANKING_SNAPSHOT_ENABLED']:
+            print("Skipped the ranking snapshot; start the server with RANKING_SNAPSHOT_ENABLED=false to query the database.")
+        else:
+            ranking_snapshot.build_snapshot()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+# gunicorn.conf.py
+# Loaded by `gunicorn app:app` from the project root (render.yaml passes it explicitly).
+import os
+
+# Threaded workers: a request waiting on googleapis or Reddit (/api/scrape,
+# /api/config/test) only ties up one thread, not the whole worker.
+# Set GUNICORN_WORKER_CLASS=sync to get the old one-request-per-worker behaviour.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Keep in sync with the SQLAlchemy pool size in backend/config.py.
+# gunicorn silently swaps sync for gthread when threads > 1, so sync gets one
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if worker_class != 'sync' else 1
+
+# /api/scrape can legitimately run for minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 600))
+graceful_timeout = 30
+keepalive = 5
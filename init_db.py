@@ -1,4 +1,7 @@
 # init_db.py
+import os
+
+os.environ['SCHEDULER_ENABLED'] = 'false' # Must be set before the app loads its Config
 from app import create_app
 from backend import db
 
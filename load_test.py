@@ -0,0 +1,104 @@
+# load_test.py
+"""Drive a running TrendTracker API with concurrent mixed read traffic.
+
+Start the server first (e.g. `gunicorn app:app`), then:
+    python load_test.py --url http://localhost:8000 --clients 200 --duration 60
+
+Reports throughput and latency percentiles per endpoint.
+
+Default, platform, category and paginated listings within the snapshot
+depth are normally answered from the ranking snapshot. To measure the
+database path (e.g. the category ilike filter or a new index), start the
+server with RANKING_SNAPSHOT_ENABLED=false.
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+PLATFORMS = ['youtube', 'reddit']
+CATEGORY_TERMS = ['funny', 'sad', 'anime', 'movie', 'music', 'dance', 'tech', 'scene', 'viral']
+
+# (name, weight, path builder) - roughly what the dashboard sends
+ENDPOINTS = [
+    ('trends', 40, lambda rng: '/api/trends'),
+    ('trends?platform', 20, lambda rng: f"/api/trends?platform={rng.choice(PLATFORMS)}"),
+    ('trends?category', 20, lambda rng: f"/api/trends?category={rng.choice(CATEGORY_TERMS)}"),
+    ('trends?offset', 10, lambda rng: f"/api/trends?offset={rng.randint(1, 50) * 20}"),
+    ('config', 10, lambda rng: '/api/config'),
+]
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+class Results:
+    """Latencies and error counts per endpoint, shared by all client threads."""
+    def __init__(self):
+        self.latencies = {name: [] for name, _, _ in ENDPOINTS}
+        self.errors = {name: 0 for name, _, _ in ENDPOINTS}
+        self._lock = threading.Lock()
+
+    def record(self, name, latency, ok):
+        with self._lock:
+            if ok:
+                self.latencies[name].append(latency)
+            else:
+                self.errors[name] += 1
+
+def run_client(base_url, deadline, results, seed):
+    """One simulated client: issue weighted random requests until the deadline."""
+    rng = random.Random(seed)
+    names = [name for name, _, _ in ENDPOINTS]
+    weights = [weight for _, weight, _ in ENDPOINTS]
+    builders = {name: build for name, _, build in ENDPOINTS}
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = session.get(base_url + builders[name](rng), timeout=30)
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        results.record(name, time.perf_counter() - start, ok)
+
+def report(results, elapsed):
+    print(f"\n{'endpoint':<18}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    total_ok = total_errors = 0
+    for name, _, _ in ENDPOINTS:
+        latencies = sorted(results.latencies[name])
+        errors = results.errors[name]
+        total_ok += len(latencies)
+        total_errors += errors
+        print(f"{name:<18}{len(latencies):>10}{errors:>8}{len(latencies) / elapsed:>10.1f}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 90) * 1000:>10.1f}"
+              f"{percentile(latencies, 99) * 1000:>10.1f}{(latencies[-1] if latencies else 0) * 1000:>10.1f}")
+    print(f"\nTotal: {total_ok} ok, {total_errors} errors in {elapsed:.1f}s ({total_ok / elapsed:.1f} req/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the TrendTracker read endpoints.")
+    parser.add_argument('--url', default='http://localhost:5000', help="Base URL of the API (default: http://localhost:5000)")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent clients (default: 50)")
+    parser.add_argument('--duration', type=float, default=30, help="Test length in seconds (default: 30)")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed for the request mix (default: 1)")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip('/')
+    print(f"Running {args.clients} clients against {base_url} for {args.duration:.0f}s...")
+    results = Results()
+    start = time.monotonic()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        for i in range(args.clients):
+            pool.submit(run_client, base_url, deadline, results, args.seed + i)
+    report(results, time.monotonic() - start)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# scrape_worker.py
+"""Run sharded YouTube scrape queries from the database work queue.
+
+Start any number of these, on any node that can reach DATABASE_URL, with
+SCRAPE_SHARDING=true set for the web service:
+    python scrape_worker.py
+"""
+import argparse
+import os
+import time
+
+os.environ['SCHEDULER_ENABLED'] = 'false' # Scrape only from the queue; must be set before the app loads its Config
+from app import app
+from backend import db
+from backend.scrapers import shard_queue
+from backend.scrapers.known_ids import known_ids
+from backend.scrapers.youtube_scraper import YouTubeScraper
+
+def main():
+    parser = argparse.ArgumentParser(description="Process sharded scrape queries from the work queue.")
+    parser.add_argument('--poll-interval', type=float, default=5, help="Seconds to wait when the queue is empty (default: 5)")
+    parser.add_argument('--once', action='store_true', help="Exit when the queue is empty instead of polling")
+    args = parser.parse_args()
+
+    owner = shard_queue.worker_id()
+    with app.app_context():
+        scraper = YouTubeScraper()
+        if not scraper.is_configured():
+            print("Worker: YouTube API key not configured, exiting.")
+            return
+        print(f"Worker {owner}: Waiting for shards...")
+        while True:
+            try:
+                shard = shard_queue.claim('youtube', owner=owner)
+            except Exception as e:
+                print(f"Worker {owner}: Error claiming shard: {e}")
+                db.session.rollback()
+                shard = None
+            if shard:
+                try:
+                    shard_queue.process_shard(scraper, shard, owner)
+                except Exception as e:
+                    # e.g. the connection dropped while recording the outcome; the
+                    # lease expires and the shard is reclaimed
+                    print(f"Worker {owner}: Error processing shard {shard.id}: {e}")
+                    db.session.rollback()
+                continue
+            if args.once:
+                break
+            # Pick up trends committed since the last run before the next one starts
+            known_ids.reload('youtube')
+            time.sleep(args.poll_interval)
+
+if __name__ == '__main__':
+    main()